@@ -14,6 +14,8 @@ from .simulation import (
     fetch_weather_data,
     interpolate_to_15min,
     calculate_vorlauf,
+    calculate_vorlauf_array,
+    compute_vorlauf,
     generate_simulation,
 )
 
@@ -36,6 +38,8 @@ __all__ = [
     "fetch_weather_data",
     "interpolate_to_15min",
     "calculate_vorlauf",
+    "calculate_vorlauf_array",
+    "compute_vorlauf",
     "generate_simulation",
     # Analysis
     "detect_temperature_limits",
@@ -5,35 +5,232 @@ This module provides functions to extract heating curve parameters from
 noisy sensor data. It includes pattern detection, regression algorithms,
 and parameter extraction without requiring prior knowledge of system configuration.
 
+Columns are read once into NumPy arrays and all filtering happens on those
+arrays, so both pandas and Polars DataFrames are accepted as input.
+
 Functions:
+    read_sensor_csv: Read a sensor CSV with typed analysis columns
     detect_temperature_limits: Detect upper/lower temperature limits from data
-    detect_day_night_modes: Detect day/night modes using clustering
+    detect_day_night_modes: Detect day/night modes by clustering residuals
     fit_ols: Fit OLS regression and extract parameters
     fit_ransac: Fit RANSAC regression (outlier robust)
     extract_parameters: Main function to extract heating curve parameters
     compare_with_ground_truth: Compare extracted parameters with known values
 """
 
+import csv
+import warnings
+
 import pandas as pd
 import numpy as np
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List, NamedTuple
+
+try:
+    import pyarrow  # ships with Streamlit; enables the fast CSV reader
+    CSV_ENGINE = "pyarrow"
+    _PYARROW_ERRORS: Tuple[type, ...] = (pyarrow.ArrowException,)
+except ImportError:
+    CSV_ENGINE = "c"
+    _PYARROW_ERRORS = ()
+
+
+# Human-readable names for mode labels: MODE_LABELS[labels] -> 'Night'/'Day'
+MODE_LABELS = np.array(['Night', 'Day'])
+
+# Columns consumed by extract_parameters, and their parse dtypes. is_night is
+# nullable so missing flags stay missing on every parser engine
+ANALYSIS_COLUMNS = ("t_outdoor", "t_vorlauf", "is_night")
+ANALYSIS_DTYPES = {"t_outdoor": np.float32, "t_vorlauf": np.float32, "is_night": "boolean"}
+
+# Smallest share of samples a detected mode may hold; smaller splits are
+# treated as outliers rather than a second operating mode
+MIN_MODE_FRACTION = 0.05
+
+
+def _column(df: Any, col: str, dtype: Any = np.float64) -> np.ndarray:
+    """
+    Extract a column as a NumPy array through the array protocol.
+
+    Works for pandas and Polars frames alike (missing values become NaN for
+    float dtypes), so callers holding a Polars frame can pass it directly.
+    """
+    return np.asarray(df[col], dtype=dtype)
+
+
+def _flag_column(df: Any, col: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extract a boolean column as (values, present).
+
+    Missing flags (None, NaN, pd.NA) are marked absent in present and are
+    False in values, instead of being coerced to True or False.
+    """
+    raw = np.asarray(df[col])
+    if raw.dtype == bool:
+        return raw, np.ones(raw.size, dtype=bool)
+    present = ~pd.isna(raw)
+    values = np.zeros(raw.size, dtype=bool)
+    values[present] = raw[present].astype(bool)
+    return values, present
+
+
+def csv_header(source) -> List[str]:
+    """Column names exactly as written in the first CSV line ('' if unnamed)."""
+    header = next(csv.reader([source.readline().decode("utf-8-sig")]), [])
+    source.seek(0)
+    return header
+
+
+def read_sensor_csv(
+    source,
+    usecols: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, Any]] = None,
+    engine: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Read a sensor CSV whose first column is the timestamp index.
 
-from sklearn.linear_model import LinearRegression, RANSACRegressor
-from sklearn.cluster import KMeans
-from sklearn.metrics import r2_score, mean_absolute_error
+    Uses the multithreaded pyarrow parser when available and falls back to
+    the default C parser (also for files pyarrow rejects). Both engines
+    return the same dtypes, including a nullable is_night column.
+
+    Parameters
+    ----------
+    source : binary file-like
+        Seekable CSV source, e.g. io.BytesIO
+    usecols : List[str], optional
+        Names as written in the header line (an unnamed index column is
+        ''); must include the index column
+    dtype : Dict[str, Any], optional
+        Column dtypes (default ANALYSIS_DTYPES)
+    engine : str, optional
+        'pyarrow' or 'c' (default CSV_ENGINE)
+
+    Returns
+    -------
+    pd.DataFrame
+        Parsed frame, with a DatetimeIndex if the index holds dates
+    """
+    if dtype is None:
+        dtype = ANALYSIS_DTYPES
+    if engine is None:
+        engine = CSV_ENGINE
+    options = {"index_col": 0, "dtype": dtype}
+    positions = None
+    if usecols is not None:
+        # pyarrow selects by raw header name, the C parser by position (it
+        # renames an empty header to 'Unnamed: 0')
+        header = csv_header(source)
+        positions = sorted(header.index(c) for c in usecols)
+
+    if engine == "pyarrow":
+        try:
+            df = pd.read_csv(source, engine="pyarrow", usecols=usecols, **options)
+        except (ValueError, KeyError, *_PYARROW_ERRORS):
+            source.seek(0)
+        else:
+            if df.index.name == "":
+                df.index.name = None
+            # Like parse_dates=True, only text indexes are parsed as dates
+            index_dtype = df.index.dtype
+            if index_dtype == object or pd.api.types.is_string_dtype(index_dtype):
+                try:
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore", UserWarning)
+                        df.index = pd.to_datetime(df.index)
+                except (ValueError, TypeError):
+                    pass  # Keep a non-date index as-is
+            return df
+
+    return pd.read_csv(source, parse_dates=True, usecols=positions, **options)
+
+
+def _segment_moments(segment: np.ndarray) -> Tuple[int, float, float]:
+    """Return (count, mean, variance) of a 1-D segment; zeros if empty."""
+    if segment.size == 0:
+        return 0, 0.0, 0.0
+    mean = segment.mean(dtype=np.float64)
+    return segment.size, mean, segment.var(dtype=np.float64)
+
+
+def _limits_core(
+    vorlauf: np.ndarray,
+    percentile_threshold: float
+) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Numeric core of detect_temperature_limits on a clean 1-D array.
+
+    Works on float32 input (half the memory traffic for the partition);
+    segment moments are accumulated in float64.
+
+    Parameters
+    ----------
+    vorlauf : np.ndarray
+        One-dimensional Vorlauf temperatures without NaN values
+    percentile_threshold : float
+        Fraction of data to analyze at each end
+
+    Returns
+    -------
+    Tuple[Optional[float], Optional[float]]
+        (upper_limit, lower_limit) - None if no limit detected
+    """
+    n = vorlauf.size
+
+    # Empty tails, or too few points for meaningful tails: a slice of one or
+    # two values has near-zero std and would always be reported as a plateau
+    if percentile_threshold <= 0 or n < max(100, int(1 / percentile_threshold) * 2):
+        return None, None
+
+    # Get top and bottom percentile data
+    top_idx = int((1 - percentile_threshold) * n)
+    bottom_idx = int(percentile_threshold * n)
+
+    # Partial sort is enough: mean/std do not need ordered slices
+    vorlauf_part = np.partition(vorlauf, (bottom_idx, top_idx))
+
+    # Moments of bottom / middle / top segments; the overall std follows
+    # from the combined-variance formula, so the full array is walked once
+    segments = (
+        vorlauf_part[:bottom_idx],
+        vorlauf_part[bottom_idx:top_idx],
+        vorlauf_part[top_idx:],
+    )
+    counts, means, variances = np.array(
+        [_segment_moments(segment) for segment in segments]
+    ).T
+    overall_mean = (counts * means).sum() / n
+    overall_std = np.sqrt(
+        (counts * (variances + (means - overall_mean) ** 2)).sum() / n
+    )
+
+    # Detect limits if std is low (indicates plateau/clamping)
+    upper_limit = None
+    lower_limit = None
+
+    if counts[2] > 0:
+        if np.sqrt(variances[2]) < overall_std / 3:
+            upper_limit = means[2]
+
+    if counts[0] > 0:
+        if np.sqrt(variances[0]) < overall_std / 3:
+            lower_limit = means[0]
+
+    return upper_limit, lower_limit
 
 
 def detect_temperature_limits(
     df: pd.DataFrame,
     vorlauf_col: str = 't_vorlauf',
-    percentile_threshold: float = 0.01
+    percentile_threshold: float = 0.01,
+    values: Optional[np.ndarray] = None
 ) -> Tuple[Optional[float], Optional[float]]:
     """
     Detect upper and lower temperature limits from Vorlauf distribution.
 
     Uses percentile analysis to identify potential clamping/plateau regions.
     A limit is detected if the top/bottom percentile values have low variance
-    compared to the overall data.
+    compared to the overall data. Series shorter than
+    max(100, 2 / percentile_threshold) points are skipped.
 
     Parameters
     ----------
@@ -43,41 +240,98 @@ def detect_temperature_limits(
         Name of the Vorlauf temperature column
     percentile_threshold : float
         Fraction of data to analyze at each end (default 0.01 = 1%)
+    values : np.ndarray, optional
+        Pre-cleaned Vorlauf values without NaN. If given, df is not read.
 
     Returns
     -------
     Tuple[Optional[float], Optional[float]]
         (upper_limit, lower_limit) - None if no limit detected
     """
-    vorlauf = df[vorlauf_col].dropna().values
-    vorlauf_sorted = np.sort(vorlauf)
-    n = len(vorlauf_sorted)
+    # float32 is ample for ~0.1°C sensor resolution
+    if values is None:
+        vorlauf = _column(df, vorlauf_col, np.float32)
+        vorlauf = vorlauf[~np.isnan(vorlauf)]
+    else:
+        vorlauf = np.asarray(values, dtype=np.float32)
+    return _limits_core(vorlauf, percentile_threshold)
 
-    # Get top and bottom percentile data
-    top_idx = int((1 - percentile_threshold) * n)
-    bottom_idx = int(percentile_threshold * n)
 
-    top_values = vorlauf_sorted[top_idx:]
-    bottom_values = vorlauf_sorted[:bottom_idx]
+def _split_two_means(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split 1-D values into two clusters with the optimal 2-means partition.
 
-    # Overall variability
-    overall_std = np.std(vorlauf)
+    For one-dimensional data the optimal k-means clusters are contiguous in
+    sorted order, so every split point can be scored from prefix sums. The
+    same prefix sums give the cluster centroids without another pass.
 
-    # Detect limits if std is low (indicates plateau/clamping)
-    upper_limit = None
-    lower_limit = None
+    Parameters
+    ----------
+    values : np.ndarray
+        One-dimensional values to split
 
-    if len(top_values) > 0:
-        top_std = np.std(top_values)
-        if top_std < overall_std / 3:
-            upper_limit = np.mean(top_values)
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        (clusters, centroids) - cluster index per value (1 for the upper
+        cluster, 0 for the lower) and the mean of each cluster
+    """
+    n = values.size
+    if n < 2:
+        centroids = np.array([values[0] if n else np.nan, np.nan])
+        return np.zeros(n, dtype=np.int8), centroids
 
-    if len(bottom_values) > 0:
-        bottom_std = np.std(bottom_values)
-        if bottom_std < overall_std / 3:
-            lower_limit = np.mean(bottom_values)
+    values_sorted = np.sort(values)
+    csum = np.cumsum(values_sorted)
+    k = np.arange(1, n)
+    lower_mean = csum[:-1] / k
+    upper_mean = (csum[-1] - csum[:-1]) / (n - k)
 
-    return upper_limit, lower_limit
+    # Maximising between-cluster variance minimises within-cluster SSE
+    score = k * (n - k) * (upper_mean - lower_mean) ** 2
+    threshold = values_sorted[np.argmax(score)]
+
+    # Ties with the threshold belong to the lower cluster
+    n_lower = np.searchsorted(values_sorted, threshold, side='right')
+    centroids = np.array([
+        csum[n_lower - 1] / n_lower,
+        (csum[-1] - csum[n_lower - 1]) / (n - n_lower) if n_lower < n else np.nan,
+    ])
+
+    return (values > threshold).astype(np.int8), centroids
+
+
+def _residual_split_core(
+    x: np.ndarray,
+    y: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Numeric core of detect_day_night_modes on clean float64 arrays.
+
+    Fits a closed-form simple linear regression and splits its residuals
+    into a lower (0) and upper (1) cluster.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Outdoor temperatures (n_samples,)
+    y : np.ndarray
+        Vorlauf temperatures (n_samples,)
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        (clusters, cluster_means) - cluster index per sample and the mean
+        residual of each cluster
+    """
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    slope = (dx * (y - y_mean)).sum() / (dx ** 2).sum()
+    intercept = y_mean - slope * x_mean
+    residuals = y - (slope * x + intercept)
+
+    return _split_two_means(residuals)
 
 
 def detect_day_night_modes(
@@ -87,9 +341,9 @@ def detect_day_night_modes(
     n_clusters: int = 2
 ) -> Tuple[np.ndarray, float]:
     """
-    Detect day/night operating modes using K-Means clustering.
+    Detect day/night operating modes by clustering regression residuals.
 
-    Strategy: Fit a simple linear regression, then cluster residuals
+    Strategy: Fit a simple linear regression, then split residuals
     into two groups representing day (higher) and night (lower) modes.
 
     Parameters
@@ -101,43 +355,51 @@ def detect_day_night_modes(
     vorlauf_col : str
         Name of Vorlauf temperature column
     n_clusters : int
-        Number of clusters (default 2 for day/night)
+        Number of clusters (only 2 is supported, for day/night)
 
     Returns
     -------
     Tuple[np.ndarray, float]
         (mode_labels, separation)
-        mode_labels: Array of 'Day' or 'Night' for each row
+        mode_labels: int8 array, 1 for day and 0 for night (see MODE_LABELS)
         separation: Temperature difference between modes (°C)
     """
-    # Get valid data
-    mask = df[vorlauf_col].notna()
-    X = df.loc[mask, outdoor_col].values.reshape(-1, 1)
-    y = df.loc[mask, vorlauf_col].values
-
-    # Fit simple linear regression
-    lr = LinearRegression()
-    lr.fit(X, y)
-    y_pred = lr.predict(X)
-    residuals = y - y_pred
+    if n_clusters != 2:
+        raise ValueError(f"Only n_clusters=2 is supported, got {n_clusters}")
 
-    # Cluster residuals
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-    clusters = kmeans.fit_predict(residuals.reshape(-1, 1))
+    # Get valid data
+    y = _column(df, vorlauf_col)
+    mask = ~np.isnan(y)
+    x = _column(df, outdoor_col)[mask]
+    y = y[mask]
 
-    # Determine which cluster is day (higher) vs night (lower)
-    cluster_means = [residuals[clusters == i].mean() for i in range(n_clusters)]
-    day_cluster = np.argmax(cluster_means)
+    # Fit regression and cluster residuals; cluster 1 (higher) is day
+    clusters, cluster_means = _residual_split_core(x, y)
 
-    # Create labels
-    labels = np.where(clusters == day_cluster, 'Day', 'Night')
+    # Cluster index doubles as the label: 1 = day, 0 = night
+    labels = clusters
 
     # Calculate separation
-    separation = abs(cluster_means[0] - cluster_means[1])
+    separation = abs(cluster_means[1] - cluster_means[0])
 
     return labels, separation
 
 
+# Relative variance below which a column is treated as constant (sum of
+# squared deviations <= rtol * n * mean²)
+_CONSTANT_RTOL = 1e-12
+
+
+class LinearFit(NamedTuple):
+    """Fitted line y = slope * x + intercept."""
+    slope: float
+    intercept: float
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predict Vorlauf temperatures for outdoor temperatures X."""
+        return self.slope * np.asarray(X).ravel() + self.intercept
+
+
 def fit_ols(
     X: np.ndarray,
     y: np.ndarray
@@ -145,6 +407,9 @@ def fit_ols(
     """
     Fit OLS (Ordinary Least Squares) regression.
 
+    Uses the closed-form solution for a single feature; R² is derived from
+    the same sums (R² = slope * Sxy / Syy), so no predictions are built.
+
     Parameters
     ----------
     X : np.ndarray
@@ -159,33 +424,136 @@ def fit_ols(
         - slope: Regression slope
         - intercept: Regression intercept
         - r2: R² score
-        - model: Fitted LinearRegression object
+        - model: Fitted LinearFit object
     """
-    if len(X.shape) == 1:
-        X = X.reshape(-1, 1)
-
-    model = LinearRegression()
-    model.fit(X, y)
-    y_pred = model.predict(X)
+    x = np.asarray(X, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64)
+
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    dy = y - y_mean
+    # Dot products reduce without materializing the elementwise products
+    sxy = dx @ dy
+    sxx = dx @ dx
+    syy = dy @ dy
+
+    slope = sxy / sxx
+    intercept = y_mean - slope * x_mean
+
+    # Constant y (up to rounding in the mean) is fitted exactly: R² = 1, as
+    # sklearn's r2_score reports, instead of 0/0
+    if syy <= _CONSTANT_RTOL * y.size * y_mean * y_mean:
+        r2 = 1.0
+    else:
+        r2 = slope * sxy / syy
 
     return {
-        'slope': model.coef_[0],
-        'intercept': model.intercept_,
-        'r2': r2_score(y, y_pred),
-        'model': model
+        'slope': slope,
+        'intercept': intercept,
+        'r2': r2,
+        'model': LinearFit(slope, intercept)
     }
 
 
+def _fit_ols_grouped(
+    x: np.ndarray,
+    y: np.ndarray,
+    groups: np.ndarray,
+    n_groups: int
+) -> List[Dict[str, Any]]:
+    """
+    Fit independent OLS lines for several groups in one pass.
+
+    Per-group sufficient statistics (n, Σx, Σy, Σx², Σxy, Σy²) are
+    accumulated with np.bincount, so all groups share a single traversal of
+    x and y and each fit reduces to a few scalar operations (the normal
+    equations). Data are centred on the global means first so the
+    sum-of-squares differences do not lose precision.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Outdoor temperatures (n_samples,)
+    y : np.ndarray
+        Vorlauf temperatures (n_samples,)
+    groups : np.ndarray
+        Integer group index per sample, in [0, n_groups)
+    n_groups : int
+        Number of groups
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One fit_ols-style dictionary per group; empty for groups without data
+    """
+    x0 = x.mean()
+    y0 = y.mean()
+    xc = x - x0
+    yc = y - y0
+
+    counts = np.bincount(groups, minlength=n_groups)
+    sx = np.bincount(groups, weights=xc, minlength=n_groups)
+    sy = np.bincount(groups, weights=yc, minlength=n_groups)
+    sxx = np.bincount(groups, weights=xc * xc, minlength=n_groups)
+    sxy = np.bincount(groups, weights=xc * yc, minlength=n_groups)
+    syy = np.bincount(groups, weights=yc * yc, minlength=n_groups)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = sx / counts
+        y_mean = sy / counts
+        Sxx = sxx - sx * x_mean
+        Sxy = sxy - sx * y_mean
+        Syy = syy - sy * y_mean
+        slope = Sxy / Sxx
+        intercept = y0 + y_mean - slope * (x0 + x_mean)
+        constant_y = Syy <= _CONSTANT_RTOL * counts * (y0 + y_mean) ** 2
+        r2 = np.where(constant_y, 1.0, slope * Sxy / Syy)
+
+    fits = []
+    for g in range(n_groups):
+        if counts[g] == 0:
+            fits.append({})
+            continue
+        fits.append({
+            'slope': slope[g],
+            'intercept': intercept[g],
+            'r2': r2[g],
+            'model': LinearFit(slope[g], intercept[g])
+        })
+
+    return fits
+
+
+# Upper bound on trial x sample elements scored at once (bounds peak memory)
+_RANSAC_BATCH_ELEMENTS = 2_000_000
+
+# Trials per batch; the adaptive stopping rule is checked between batches
+_RANSAC_TRIALS_PER_BATCH = 8
+
+
 def fit_ransac(
     X: np.ndarray,
     y: np.ndarray,
     min_samples: float = 0.8,
-    random_state: int = 42
+    max_trials: int = 20,
+    stop_probability: float = 0.99,
+    random_state: int = 42,
+    residual_threshold: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Fit RANSAC (Random Sample Consensus) regression.
 
     RANSAC is robust to outliers by iteratively fitting to inlier subsets.
+    With large subsets (min_samples=0.8) a handful of trials already
+    converge, so the trial budget is kept small. Trials run in small
+    batches and sampling stops early once the best inlier ratio so far
+    makes further trials unnecessary.
+
+    Follows sklearn's RANSACRegressor (random subsets, inliers within the
+    median absolute deviation of y, best consensus set refitted), but all
+    trials of a batch are fitted and scored at once: subset sums come from
+    one matrix product and residuals are broadcast over the batch.
 
     Parameters
     ----------
@@ -194,9 +562,16 @@ def fit_ransac(
     y : np.ndarray
         Vorlauf temperatures (n_samples,)
     min_samples : float
-        Minimum fraction of samples required as inliers
+        Fraction of samples drawn for each trial fit
+    max_trials : int
+        Maximum number of random subsets evaluated (default 20)
+    stop_probability : float
+        Stop early once an outlier-free subset was drawn with this confidence
     random_state : int
         Random seed for reproducibility
+    residual_threshold : float, optional
+        Maximum absolute residual of an inlier; defaults to the median
+        absolute deviation of y
 
     Returns
     -------
@@ -206,28 +581,130 @@ def fit_ransac(
         - intercept: Regression intercept
         - r2: R² score (on inliers only)
         - inlier_ratio: Fraction of data identified as inliers
-        - model: Fitted RANSACRegressor object
+        - model: Fitted LinearFit object (refit on inliers)
     """
-    if len(X.shape) == 1:
-        X = X.reshape(-1, 1)
-
-    model = RANSACRegressor(random_state=random_state, min_samples=min_samples)
-    model.fit(X, y)
-
-    # Get inlier statistics
-    inlier_mask = model.inlier_mask_
-    y_pred_inliers = model.predict(X[inlier_mask])
-    r2 = r2_score(y[inlier_mask], y_pred_inliers)
+    x = np.asarray(X, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64)
+    n = x.size
+    n_subset = int(np.ceil(min_samples * n)) if min_samples < 1 else int(min_samples)
+    if not 2 <= n_subset <= n:
+        raise ValueError(f"min_samples={min_samples} is invalid for {n} samples")
+
+    if residual_threshold is None:
+        residual_threshold = np.median(np.abs(y - np.median(y)))
+
+    # Constant x admits no line fit on any subset: fail before sampling
+    if np.ptp(x) == 0:
+        raise ValueError("RANSAC needs at least two distinct x values")
+
+    # Centred copies keep the subset sums well conditioned
+    xc = x - x.mean()
+    yc = y - y.mean()
+    moments = np.column_stack([xc, yc, xc * xc, xc * yc])
+
+    # Residual scoring is the (trials x samples) bandwidth-bound step; float32
+    # halves the bytes moved and is ample for sensor temperatures. Subset
+    # sums and the final refit stay in float64.
+    xc32 = xc.astype(np.float32)
+    yc32 = yc.astype(np.float32)
+    threshold32 = np.float32(residual_threshold)
+
+    rng = np.random.default_rng(random_state)
+    batch_size = max(1, min(_RANSAC_TRIALS_PER_BATCH, _RANSAC_BATCH_ELEMENTS // n))
+    best_count, best_inliers = 0, None
+    trials_done = 0
+
+    while trials_done < max_trials:
+        batch = min(batch_size, max_trials - trials_done)
+
+        # Random subsets of exactly n_subset samples as a 0/1 weight matrix
+        keys = rng.random((batch, n))
+        kth = np.partition(keys, n_subset - 1, axis=1)[:, n_subset - 1:n_subset]
+        weights = (keys <= kth).astype(np.float64)
+
+        # Closed-form line fit for every subset in the batch
+        sx, sy, sxx, sxy = (weights @ moments).T
+        # Subsets with (near-)constant x are dropped before scoring
+        denom = n_subset * sxx - sx * sx
+        valid = denom > 1e-12 * n_subset * sxx
+        trials_done += batch
+        if valid.any():
+            sx, sy, sxy, denom = sx[valid], sy[valid], sxy[valid], denom[valid]
+            slope = (n_subset * sxy - sx * sy) / denom
+            intercept = (sy - slope * sx) / n_subset
+            slope32 = slope.astype(np.float32)[:, None]
+            intercept32 = intercept.astype(np.float32)[:, None]
+            inliers = np.abs(yc32 - (slope32 * xc32 + intercept32)) <= threshold32
+
+            counts = inliers.sum(axis=1)
+            k = counts.argmax()
+            if counts[k] > best_count:
+                best_count, best_inliers = counts[k], inliers[k]
+
+        # Same early stop as sklearn: enough trials for the observed inlier ratio
+        inlier_ratio = best_count / n
+        if inlier_ratio == 1.0:
+            break
+        outlier_free = inlier_ratio ** n_subset
+        if outlier_free > 0:
+            needed = np.log(1 - stop_probability) / np.log1p(-outlier_free)
+            if trials_done >= needed:
+                break
+
+    if best_inliers is None:
+        raise ValueError("RANSAC could not find a valid consensus set")
+
+    fit = fit_ols(x[best_inliers], y[best_inliers])
 
     return {
-        'slope': model.estimator_.coef_[0],
-        'intercept': model.estimator_.intercept_,
-        'r2': r2,
-        'inlier_ratio': inlier_mask.sum() / len(y),
-        'model': model
+        'slope': fit['slope'],
+        'intercept': fit['intercept'],
+        'r2': fit['r2'],
+        'inlier_ratio': best_count / n,
+        'model': fit['model']
     }
 
 
+def _fit_ransac_or_empty(X: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
+    """fit_ransac, or an empty result when the data admit no line fit."""
+    try:
+        return fit_ransac(X, y)
+    except ValueError:
+        return {}
+
+
+def _map_fits(
+    fit_func,
+    datasets: List[Tuple[np.ndarray, np.ndarray]],
+    n_jobs: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    Apply fit_func to each (X, y) pair, optionally on a joblib thread pool.
+
+    Parameters
+    ----------
+    fit_func : callable
+        Fit function taking (X, y), e.g. fit_ransac
+    datasets : List[Tuple[np.ndarray, np.ndarray]]
+        Independent (X, y) pairs to fit
+    n_jobs : int
+        Number of joblib threads; 1 runs serially (default)
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        Fit results in the order of datasets
+    """
+    if n_jobs == 1 or len(datasets) < 2:
+        return [fit_func(X, y) for X, y in datasets]
+
+    from joblib import Parallel, delayed
+
+    return Parallel(n_jobs=n_jobs, prefer='threads')(
+        delayed(fit_func)(X, y) for X, y in datasets
+    )
+
+
 def extract_parameters(
     df: pd.DataFrame,
     outdoor_col: str = 't_outdoor',
@@ -235,7 +712,8 @@ def extract_parameters(
     algorithms: list = ['OLS', 'RANSAC'],
     t_base: float = 20.0,
     use_detected_modes: bool = False,
-    is_night_col: Optional[str] = 'is_night'
+    is_night_col: Optional[str] = 'is_night',
+    n_jobs: int = 1
 ) -> Dict[str, Any]:
     """
     Extract heating curve parameters from sensor data.
@@ -268,6 +746,9 @@ def extract_parameters(
         If False, use is_night_col from data.
     is_night_col : str, optional
         Column name for night mode indicator (used if use_detected_modes=False)
+    n_jobs : int
+        Threads used for independent RANSAC fits (default 1 = serial);
+        useful for parameter sweeps on multi-core machines
 
     Returns
     -------
@@ -283,8 +764,15 @@ def extract_parameters(
         'algorithms': {}
     }
 
+    # Read columns once; the NaN mask is shared by the steps below
+    x_all = _column(df, outdoor_col)
+    y_all = _column(df, vorlauf_col)
+    not_nan = ~np.isnan(y_all)
+
     # Step 1: Detect temperature limits
-    upper_limit, lower_limit = detect_temperature_limits(df, vorlauf_col)
+    upper_limit, lower_limit = detect_temperature_limits(
+        df, vorlauf_col, values=y_all[not_nan]
+    )
     results['detected_limits']['upper'] = upper_limit
     results['detected_limits']['lower'] = lower_limit
 
@@ -292,64 +780,73 @@ def extract_parameters(
     if upper_limit is not None and lower_limit is not None:
         upper_threshold = upper_limit - 1.0
         lower_threshold = lower_limit + 1.0
-        linear_mask = (
-            (df[vorlauf_col] < upper_threshold) &
-            (df[vorlauf_col] > lower_threshold) &
-            (df[vorlauf_col].notna())
-        )
+        linear_mask = not_nan & (y_all < upper_threshold) & (y_all > lower_threshold)
     else:
-        linear_mask = df[vorlauf_col].notna()
+        linear_mask = not_nan
 
-    df_linear = df[linear_mask].copy()
+    # Samples with a missing day/night flag cannot be assigned a mode
+    use_flags = not use_detected_modes and is_night_col in df.columns
+    if use_flags:
+        night_all, has_flag = _flag_column(df, is_night_col)
+        linear_mask = linear_mask & has_flag
+
+    # Integer positions are computed once and reused for every column
+    lin_pos = np.flatnonzero(linear_mask)
+    x_lin = x_all[lin_pos]
+    y_lin = y_all[lin_pos]
 
     # Step 3: Detect or use day/night modes
     if use_detected_modes:
-        mode_labels, separation = detect_day_night_modes(
-            df_linear, outdoor_col, vorlauf_col
-        )
-        results['mode_separation'] = separation
-        day_mask = mode_labels == 'Day'
-        night_mask = mode_labels == 'Night'
+        clusters, cluster_means = _residual_split_core(x_lin, y_lin)
+        day_mask = clusters == 1
+        day_fraction = day_mask.mean() if day_mask.size else 1.0
+        if MIN_MODE_FRACTION <= day_fraction <= 1 - MIN_MODE_FRACTION:
+            results['mode_separation'] = abs(cluster_means[1] - cluster_means[0])
+            night_mask = ~day_mask
+        else:
+            # Degenerate split (e.g. a few spikes): no separate night mode
+            day_mask = np.ones(len(x_lin), dtype=bool)
+            night_mask = np.zeros(len(x_lin), dtype=bool)
     else:
-        if is_night_col in df_linear.columns:
-            day_mask = ~df_linear[is_night_col].values
-            night_mask = df_linear[is_night_col].values
+        if use_flags:
+            night_mask = night_all[lin_pos]
+            day_mask = ~night_mask
         else:
             # If no mode info, treat all as day
-            day_mask = np.ones(len(df_linear), dtype=bool)
-            night_mask = np.zeros(len(df_linear), dtype=bool)
-
-    # Step 4: Prepare data for regression
-    X_day = df_linear.loc[day_mask, outdoor_col].values.reshape(-1, 1)
-    y_day = df_linear.loc[day_mask, vorlauf_col].values
-    X_night = df_linear.loc[night_mask, outdoor_col].values.reshape(-1, 1)
-    y_night = df_linear.loc[night_mask, vorlauf_col].values
+            day_mask = np.ones(len(x_lin), dtype=bool)
+            night_mask = np.zeros(len(x_lin), dtype=bool)
+
+    # Step 4: Prepare data for regression; the mode split is computed once
+    # here and shared by every algorithm below
+    groups = night_mask.astype(np.intp)  # day = 0, night = 1
+    day_pos = np.flatnonzero(day_mask)
+    night_pos = np.flatnonzero(night_mask)
+    x_day = x_lin[day_pos]
+    y_day = y_lin[day_pos]
+    x_night = x_lin[night_pos]
+    y_night = y_lin[night_pos]
 
     # Step 5: Apply each algorithm
     for algo in algorithms:
         algo_results = {'day': {}, 'night': {}, 'parameters': {}}
 
         if algo.upper() == 'OLS':
-            # Day mode
-            if len(X_day) > 0:
-                day_fit = fit_ols(X_day, y_day)
-                algo_results['day'] = day_fit
-
-            # Night mode
-            if len(X_night) > 0:
-                night_fit = fit_ols(X_night, y_night)
-                algo_results['night'] = night_fit
+            # Day (group 0) and night (group 1) fitted in one pass
+            day_fit, night_fit = _fit_ols_grouped(x_lin, y_lin, groups, 2)
+            algo_results['day'] = day_fit
+            algo_results['night'] = night_fit
 
         elif algo.upper() == 'RANSAC':
-            # Day mode
-            if len(X_day) > 10:  # RANSAC needs minimum samples
-                day_fit = fit_ransac(X_day, y_day)
-                algo_results['day'] = day_fit
-
-            # Night mode
-            if len(X_night) > 10:
-                night_fit = fit_ransac(X_night, y_night)
-                algo_results['night'] = night_fit
+            # Day and night fits are independent; RANSAC needs minimum samples
+            modes = [
+                (mode, x, y)
+                for mode, x, y in (('day', x_day, y_day), ('night', x_night, y_night))
+                if len(x) > 10
+            ]
+            # Degenerate modes (e.g. constant outdoor temperature) yield no fit
+            fits = _map_fits(_fit_ransac_or_empty, [(x, y) for _, x, y in modes], n_jobs)
+            for (mode, _, _), fit in zip(modes, fits):
+                algo_results[mode] = fit
 
         # Extract heating curve parameters from regression
         if algo_results['day']:
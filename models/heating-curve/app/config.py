@@ -14,6 +14,9 @@ Defaults:
     DEFAULT_CONFIG: Default heating curve parameters
     WINTER_PRESETS: Notable winter seasons for simulation
 
+Preset and default tables are read-only mappings; copy them with dict(...)
+before modifying.
+
 References:
     - DIN EN 12831: Heating systems in buildings - Method for calculation of
       the design heat load
@@ -24,7 +27,22 @@ References:
     - DVGW W 551: Drinking water heating and piping systems (Legionella)
 """
 
-from typing import Dict, Any
+import functools
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
+
+
+def _freeze(mapping: Dict[str, Any], depth: int = 1) -> Mapping[str, Any]:
+    """
+    Wrap a table in a read-only view.
+
+    With depth=2 each entry of the table is wrapped as well. Values below
+    that stay plain dicts/lists, so dict(...) of a table or entry yields an
+    ordinary dict that can be copied, pickled or dumped to JSON.
+    """
+    if depth > 1:
+        mapping = {k: _freeze(v, depth - 1) for k, v in mapping.items()}
+    return MappingProxyType(mapping)
 
 
 # =============================================================================
@@ -38,7 +56,7 @@ from typing import Dict, Any
 #   - Temperature limits: DIN EN 12831, heat pump manufacturer specs
 #   - KfW standards: Kreditanstalt für Wiederaufbau efficiency classes
 
-BUILDING_PRESETS: Dict[str, Dict[str, Any]] = {
+BUILDING_PRESETS: Mapping[str, Mapping[str, Any]] = _freeze({
     "Heat Pump + Floor Heating": {
         # Ref: Heat pump max Vorlauf 55°C per manufacturer specs (Viessmann, Vaillant)
         # Ref: Floor heating design temp 35°C Vorlauf per DIN EN 1264
@@ -81,7 +99,7 @@ BUILDING_PRESETS: Dict[str, Dict[str, Any]] = {
                        "Requires high flow temperatures to maintain comfort.",
         "typical_buildings": ["Pre-1940s", "Listed buildings", "Altbau"],
     },
-}
+}, depth=2)
 
 
 # =============================================================================
@@ -90,7 +108,7 @@ BUILDING_PRESETS: Dict[str, Dict[str, Any]] = {
 # Three noise models simulating different data quality scenarios.
 # These are used to test algorithm robustness.
 
-NOISE_MODELS: Dict[str, Dict[str, Any]] = {
+NOISE_MODELS: Mapping[str, Mapping[str, Any]] = _freeze({
     "Model 1": {
         "name": "Clean Data",
         "description": "Low-noise scenario for algorithm validation. "
@@ -124,7 +142,7 @@ NOISE_MODELS: Dict[str, Dict[str, Any]] = {
         "outlier_rate": 0.015,
         "stuck_sensor_rate": 0.01,
     },
-}
+}, depth=2)
 
 
 # =============================================================================
@@ -137,7 +155,7 @@ NOISE_MODELS: Dict[str, Dict[str, Any]] = {
 #   - Summer cutoff 15°C: Common controller default (Heizgrenztemperatur)
 #   - Min Vorlauf 25°C: Prevents condensation in return pipes
 
-DEFAULT_CONFIG: Dict[str, Any] = {
+DEFAULT_CONFIG: Mapping[str, Any] = _freeze({
     # Heating curve parameters
     "slope": 1.4,  # Ref: Common factory default per manufacturer settings
     "t_base": 20.0,  # Ref: DIN EN 12831 standard indoor design temperature
@@ -166,7 +184,7 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "start_date": "2023-11-01",
         "end_date": "2024-03-31",
     },
-}
+})
 
 
 # =============================================================================
@@ -175,7 +193,7 @@ DEFAULT_CONFIG: Dict[str, Any] = {
 # German cities for weather data fetching.
 # Heating curve parameters are based on German norms (DIN, VDI, EnEV/GEG).
 
-LOCATION_PRESETS: Dict[str, Dict[str, Any]] = {
+LOCATION_PRESETS: Mapping[str, Mapping[str, Any]] = _freeze({
     "Berlin": {
         "latitude": 52.52,
         "longitude": 13.41,
@@ -216,7 +234,7 @@ LOCATION_PRESETS: Dict[str, Dict[str, Any]] = {
         "longitude": 7.85,
         "description": "Southwest, warmest German city",
     },
-}
+}, depth=2)
 
 
 # =============================================================================
@@ -224,7 +242,7 @@ LOCATION_PRESETS: Dict[str, Dict[str, Any]] = {
 # =============================================================================
 # Notable winter seasons for comparing mild vs cold conditions.
 
-WINTER_PRESETS: Dict[str, Dict[str, str]] = {
+WINTER_PRESETS: Mapping[str, Mapping[str, str]] = _freeze({
     "2023-2024 (Mild)": {
         "start_date": "2023-11-01",
         "end_date": "2024-03-31",
@@ -245,7 +263,7 @@ WINTER_PRESETS: Dict[str, Dict[str, str]] = {
         "end_date": "2011-03-31",
         "description": "Cold winter, good for testing upper temperature limits",
     },
-}
+}, depth=2)
 
 
 # =============================================================================
@@ -330,26 +348,40 @@ PARAMETER_RANGES: Dict[str, Dict[str, Any]] = {
 # Helper Functions
 # =============================================================================
 
-def get_building_preset(name: str) -> Dict[str, Any]:
-    """Get configuration for a building preset, merged with defaults."""
+@functools.lru_cache(maxsize=None)
+def _merged_building(name: str) -> Mapping[str, Any]:
+    """Build the read-only default-merged configuration for a preset."""
+    preset = BUILDING_PRESETS[name]
+    return MappingProxyType({
+        **DEFAULT_CONFIG,
+        "slope": preset["slope"],
+        "t_vorlauf_max": preset["t_vorlauf_max"],
+        "t_vorlauf_min": preset["t_vorlauf_min"],
+    })
+
+
+def get_building_preset(name: str) -> Mapping[str, Any]:
+    """
+    Get configuration for a building preset, merged with defaults.
+
+    Returns a cached read-only view; use dict(...) for a mutable copy.
+    """
     if name not in BUILDING_PRESETS:
         raise ValueError(f"Unknown preset: {name}. Available: {list(BUILDING_PRESETS.keys())}")
 
-    config = DEFAULT_CONFIG.copy()
-    preset = BUILDING_PRESETS[name]
-    config["slope"] = preset["slope"]
-    config["t_vorlauf_max"] = preset["t_vorlauf_max"]
-    config["t_vorlauf_min"] = preset["t_vorlauf_min"]
+    return _merged_building(name)
 
-    return config
 
+def get_noise_config(model_name: str) -> Mapping[str, Any]:
+    """
+    Get noise configuration for a noise model.
 
-def get_noise_config(model_name: str) -> Dict[str, Any]:
-    """Get noise configuration for a noise model."""
+    Returns a read-only view; use dict(...) for a mutable copy.
+    """
     if model_name not in NOISE_MODELS:
         raise ValueError(f"Unknown model: {model_name}. Available: {list(NOISE_MODELS.keys())}")
 
-    return NOISE_MODELS[model_name].copy()
+    return NOISE_MODELS[model_name]
 
 
 def get_winter_period(preset_name: str) -> Dict[str, str]:
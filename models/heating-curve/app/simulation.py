@@ -9,27 +9,71 @@ Functions:
     fetch_weather_data: Fetch historical weather data from Open-Meteo API
     interpolate_to_15min: Convert hourly data to 15-minute resolution
     calculate_vorlauf: Calculate flow temperature using heating curve formula
+    calculate_vorlauf_array: Vectorized calculate_vorlauf for whole series
     is_night_hour: Check if hour falls within night setback period
     get_room_target: Get target room temperature based on time of day
+    compute_vorlauf: Night mode, room target and Vorlauf for arrays
     apply_noise: Apply noise model to ideal temperature data
     generate_simulation: Generate complete simulation dataset
 """
 
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 import requests
-from typing import Optional
+from typing import Optional, Tuple, Union
+
+
+# Temperatures are stored as float32: ~1e-6 relative precision is far below
+# the 0.1°C resolution of the weather data and sensors, and halves memory
+# traffic. Analysis code reads columns back as float64 where sums matter.
+TEMPERATURE_DTYPE = np.float32
+
+# Shared HTTP session so repeated fetches reuse the pooled TLS connection
+WEATHER_API_URL = "https://archive-api.open-meteo.com/v1/archive"
+WEATHER_API_TIMEOUT = 30.0  # seconds
+_session = requests.Session()
+
+
+def _weather_cache_path(
+    latitude: float,
+    longitude: float,
+    start_date: str,
+    end_date: str
+) -> Path:
+    """
+    Cache file for one (latitude, longitude, start, end) request.
+
+    Historical archive responses never change, so they are cached on disk in
+    a per-user directory ($XDG_CACHE_HOME/heating-curve, default
+    ~/.cache/heating-curve), as Parquet (a data-only format, safe to read
+    back). The directory is resolved on every call, so environment changes
+    take effect.
+    """
+    cache_dir = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "heating-curve"
+    key = hashlib.sha1(
+        f"{latitude}|{longitude}|{start_date}|{end_date}".encode()
+    ).hexdigest()
+    return cache_dir / f"{key}.parquet"
 
 
 def fetch_weather_data(
     latitude: float = 52.52,
     longitude: float = 13.41,
     start_date: str = "2023-11-01",
-    end_date: str = "2024-03-31"
+    end_date: str = "2024-03-31",
+    use_cache: bool = True
 ) -> pd.DataFrame:
     """
     Fetch historical hourly temperature data from Open-Meteo API.
 
+    Responses are cached on disk (see _weather_cache_path), keyed by location
+    and date range, so repeated runs skip the network round-trip.
+
     Parameters
     ----------
     latitude : float
@@ -40,6 +84,8 @@ def fetch_weather_data(
         Start date in YYYY-MM-DD format
     end_date : str
         End date in YYYY-MM-DD format
+    use_cache : bool
+        Read from and write to the on-disk cache (default True)
 
     Returns
     -------
@@ -50,8 +96,15 @@ def fetch_weather_data(
     ------
     requests.HTTPError
         If API request fails
+    requests.Timeout
+        If the API does not respond within WEATHER_API_TIMEOUT seconds
     """
-    url = "https://archive-api.open-meteo.com/v1/archive"
+    cache_path = _weather_cache_path(latitude, longitude, start_date, end_date)
+    if use_cache and cache_path.exists():
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception:
+            pass  # Corrupt or incompatible cache entry, fetch again
 
     params = {
         "latitude": latitude,
@@ -62,21 +115,48 @@ def fetch_weather_data(
         "timezone": "Europe/Berlin"
     }
 
-    response = requests.get(url, params=params)
+    response = _session.get(WEATHER_API_URL, params=params, timeout=WEATHER_API_TIMEOUT)
     response.raise_for_status()
 
     data = response.json()
 
-    df = pd.DataFrame({
-        "datetime": pd.to_datetime(data["hourly"]["time"]),
-        "t_outdoor": data["hourly"]["temperature_2m"]
-    })
+    # Build typed arrays directly (ISO timestamps parse natively in NumPy)
+    times = np.asarray(data["hourly"]["time"], dtype="datetime64[ns]")
+    temps = np.asarray(data["hourly"]["temperature_2m"], dtype=TEMPERATURE_DTYPE)
 
-    df = df.set_index("datetime")
+    df = pd.DataFrame(
+        {"t_outdoor": temps},
+        index=pd.DatetimeIndex(times, name="datetime")
+    )
+
+    if use_cache:
+        try:
+            cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # Write to a uniquely named temp file first, so concurrent writers
+            # (threads or processes) never share it and readers never see a
+            # partial file
+            with tempfile.NamedTemporaryFile(
+                dir=cache_path.parent, suffix=".tmp", delete=False
+            ) as tmp:
+                tmp_path = Path(tmp.name)
+            try:
+                df.to_parquet(tmp_path)
+                os.replace(tmp_path, cache_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        except (OSError, ImportError):
+            pass  # Cache is best-effort (read-only filesystem, no Parquet engine)
 
     return df
 
 
+def _is_regular_hourly(index: pd.Index) -> bool:
+    """True if index is a strictly hourly DatetimeIndex with at least two entries."""
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return False
+    return bool((np.diff(index.to_numpy()) == np.timedelta64(1, "h")).all())
+
+
 def interpolate_to_15min(df: pd.DataFrame, method: str = "linear") -> pd.DataFrame:
     """
     Interpolate hourly data to 15-minute resolution.
@@ -102,16 +182,36 @@ def interpolate_to_15min(df: pd.DataFrame, method: str = "linear") -> pd.DataFra
         freq="15min"
     )
 
-    # Reindex and interpolate
-    df_15min = df.reindex(new_index)
-    df_15min = df_15min.interpolate(method=method)
+    values = df.to_numpy()
+    if (
+        method == "linear"
+        and _is_regular_hourly(df.index)
+        and np.issubdtype(values.dtype, np.floating)
+        and not np.isnan(values).any()
+    ):
+        # Fast path (the normal Open-Meteo case): fill the three quarter-hour
+        # points between consecutive hourly samples directly
+        steps = len(df) - 1
+        out = np.empty((4 * steps + 1, values.shape[1]), dtype=values.dtype)
+        out[::4] = values
+        start, delta = values[:-1], np.diff(values, axis=0)
+        for k in (1, 2, 3):
+            out[k::4] = start + (k / 4) * delta
+        df_15min = pd.DataFrame(out, index=new_index, columns=df.columns)
+    else:
+        # Reindex and interpolate
+        df_15min = df.reindex(new_index)
+        df_15min = df_15min.interpolate(method=method)
     df_15min.index.name = "datetime"
 
-    # Add datetime features
-    df_15min["hour"] = df_15min.index.hour
-    df_15min["day_of_week"] = df_15min.index.dayofweek
-    df_15min["month"] = df_15min.index.month
-    df_15min["is_weekend"] = df_15min["day_of_week"].isin([5, 6])
+    # Add datetime features in one step
+    day_of_week = new_index.dayofweek.to_numpy()
+    df_15min = df_15min.assign(
+        hour=new_index.hour.to_numpy(),
+        day_of_week=day_of_week,
+        month=new_index.month.to_numpy(),
+        is_weekend=day_of_week >= 5
+    )
 
     return df_15min
 
@@ -165,15 +265,68 @@ def calculate_vorlauf(
     return t_vorlauf
 
 
-def is_night_hour(hour: int, night_start: int = 22, night_end: int = 6) -> bool:
+def calculate_vorlauf_array(
+    t_outdoor: np.ndarray,
+    t_room: np.ndarray,
+    slope: float,
+    t_base: float = 20.0,
+    t_min: float = 25.0,
+    t_max: float = 75.0,
+    summer_cutoff: float = 15.0
+) -> np.ndarray:
+    """
+    Vectorized calculate_vorlauf over arrays of temperatures.
+
+    Parameters
+    ----------
+    t_outdoor : np.ndarray
+        Outdoor temperatures (°C)
+    t_room : np.ndarray
+        Target room temperatures (°C), same shape as t_outdoor
+    slope : float
+        Heating curve slope (Neigung/Steilheit), typically 0.3-1.6
+    t_base : float
+        Base flow temperature (°C), default 20
+    t_min : float
+        Minimum flow temperature (°C), default 25
+    t_max : float
+        Maximum flow temperature (°C), default 75
+    summer_cutoff : float
+        Outdoor temp above which heating is off (°C), default 15
+
+    Returns
+    -------
+    np.ndarray
+        Flow temperatures (°C) as TEMPERATURE_DTYPE, NaN where heating is
+        off (summer mode)
+    """
+    t_outdoor = np.asarray(t_outdoor, dtype=TEMPERATURE_DTYPE)
+    t_room = np.asarray(t_room, dtype=TEMPERATURE_DTYPE)
+
+    # Heating curve formula, clamped to operating limits
+    t_vorlauf = t_base + slope * (t_room - t_outdoor)
+    np.clip(t_vorlauf, t_min, t_max, out=t_vorlauf)
+
+    # Summer mode: heating off
+    t_vorlauf[t_outdoor > summer_cutoff] = np.nan
+
+    return t_vorlauf
+
+
+def is_night_hour(
+    hour: Union[int, np.ndarray],
+    night_start: int = 22,
+    night_end: int = 6
+) -> Union[bool, np.ndarray]:
     """
     Determine if given hour falls within night setback period.
 
-    Handles crossing midnight (e.g., 22:00 - 06:00).
+    Handles crossing midnight (e.g., 22:00 - 06:00). Accepts a single hour
+    or an array of hours; arrays are evaluated element-wise.
 
     Parameters
     ----------
-    hour : int
+    hour : int or np.ndarray
         Hour of day (0-23)
     night_start : int
         Hour when night mode starts (default 22)
@@ -182,14 +335,14 @@ def is_night_hour(hour: int, night_start: int = 22, night_end: int = 6) -> bool:
 
     Returns
     -------
-    bool
+    bool or np.ndarray
         True if hour is within night period
     """
     # Handle crossing midnight
     if night_start > night_end:
-        return hour >= night_start or hour < night_end
+        return (hour >= night_start) | (hour < night_end)
     else:
-        return night_start <= hour < night_end
+        return (night_start <= hour) & (hour < night_end)
 
 
 def get_room_target(
@@ -226,6 +379,102 @@ def get_room_target(
         return t_room_day
 
 
+def compute_vorlauf(
+    t_outdoor: np.ndarray,
+    hours: np.ndarray,
+    slope: float,
+    t_base: float = 20.0,
+    t_room_day: float = 20.0,
+    t_room_night: float = 16.0,
+    t_min: float = 25.0,
+    t_max: float = 75.0,
+    summer_cutoff: float = 15.0,
+    night_start: int = 22,
+    night_end: int = 6
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Night mode, room target and ideal Vorlauf for arrays of readings.
+
+    Array-only kernel behind generate_simulation; also usable directly from
+    the analysis side without building a DataFrame.
+
+    Parameters
+    ----------
+    t_outdoor : np.ndarray
+        Outdoor temperatures (°C)
+    hours : np.ndarray
+        Hour of day (0-23) for each reading
+    slope : float
+        Heating curve slope (Neigung/Steilheit)
+    t_base : float
+        Base flow temperature (°C)
+    t_room_day, t_room_night : float
+        Room targets during day and night mode (°C)
+    t_min, t_max : float
+        Flow temperature operating limits (°C)
+    summer_cutoff : float
+        Outdoor temp above which heating is off (°C)
+    night_start, night_end : int
+        Night mode window (hours)
+
+    Returns
+    -------
+    tuple
+        (is_night, t_room_target, t_vorlauf_ideal) arrays
+    """
+    is_night = is_night_hour(np.asarray(hours), night_start, night_end)
+    t_room_target = np.where(is_night, t_room_night, t_room_day).astype(TEMPERATURE_DTYPE)
+    t_vorlauf = calculate_vorlauf_array(
+        t_outdoor, t_room_target, slope, t_base, t_min, t_max, summer_cutoff
+    )
+    return is_night, t_room_target, t_vorlauf
+
+
+def _apply_stuck_sensor(values: np.ndarray, stuck_mask: np.ndarray) -> np.ndarray:
+    """
+    Vectorized stuck-sensor propagation, in place.
+
+    Equivalent to the sequential rule "a stuck reading repeats the previous
+    reading unless that one is NaN" (applied left to right, index 0 never
+    stuck): within each run of stuck readings, every reading from the first
+    valid one onward takes that first valid value.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Readings, possibly containing NaN; modified in place
+    stuck_mask : np.ndarray
+        Boolean mask of readings where the sensor is stuck
+
+    Returns
+    -------
+    np.ndarray
+        values, with stuck readings replaced
+    """
+    n = values.size
+    stuck = stuck_mask.copy()
+    if n > 0:
+        stuck[0] = False
+    if not stuck.any():
+        return values
+
+    pos = np.arange(n)
+
+    # Start of the stuck run each reading belongs to
+    run_start = np.maximum.accumulate(np.where(stuck, 0, pos))
+    # First valid reading at or after each position
+    next_valid = np.minimum.accumulate(
+        np.where(np.isnan(values), n, pos)[::-1]
+    )[::-1]
+
+    # Sources are never targets themselves, so the gather is safe in place
+    source = next_valid[run_start]
+    take = source < pos
+    values[take] = values[source[take]]
+
+    return values
+
+
 def apply_noise(
     df: pd.DataFrame,
     gaussian_sigma: float = 1.5,
@@ -235,7 +484,8 @@ def apply_noise(
     outlier_rate: float = 0.0,
     stuck_sensor_rate: float = 0.0,
     vorlauf_col: str = "t_vorlauf_ideal",
-    random_seed: int = 42
+    random_seed: int = 42,
+    copy: bool = True
 ) -> pd.DataFrame:
     """
     Apply noise to ideal Vorlauf data to simulate sensor imperfections.
@@ -266,59 +516,65 @@ def apply_noise(
     vorlauf_col : str
         Name of column containing ideal Vorlauf values
     random_seed : int
-        Random seed for reproducibility
+        Seed for a local random generator (global NumPy state is untouched)
+    copy : bool
+        If False, add the column to df in place instead of to a copy
 
     Returns
     -------
     pd.DataFrame
         DataFrame with added t_vorlauf_noisy column
     """
-    np.random.seed(random_seed)
-    df = df.copy()
+    rng = np.random.default_rng(random_seed)
+    if copy:
+        df = df.copy()
 
-    # Start with ideal values
-    noisy = df[vorlauf_col].copy()
+    # Start with ideal values (plain array, modified in place)
+    noisy = df[vorlauf_col].to_numpy(dtype=TEMPERATURE_DTYPE, copy=True)
     n = len(noisy)
 
+    # One batched uniform draw, one row per enabled event type
+    event_rates = (dhw_spike_probability, outlier_rate, missing_rate, stuck_sensor_rate)
+    n_events = sum(rate > 0 for rate in event_rates)
+    uniform = iter(rng.random((n_events, n)))
+
     # 1. Gaussian noise
     if gaussian_sigma > 0:
-        noise = np.random.normal(0, gaussian_sigma, n)
-        noisy = noisy + noise
+        noisy += gaussian_sigma * rng.standard_normal(n, dtype=TEMPERATURE_DTYPE)
 
     # 2. DHW spikes (domestic hot water interference)
     if dhw_spike_probability > 0:
-        spike_mask = np.random.random(n) < dhw_spike_probability
-        noisy[spike_mask] = noisy[spike_mask] + dhw_spike_magnitude
+        spike_mask = next(uniform) < dhw_spike_probability
+        noisy[spike_mask] += dhw_spike_magnitude
 
-    # 3. Outliers (random extreme values)
+    # 3. Outliers (random extreme values, signed ±20°C)
     if outlier_rate > 0:
-        outlier_mask = np.random.random(n) < outlier_rate
-        outlier_direction = np.random.choice([-1, 1], size=n)
-        noisy[outlier_mask] = noisy[outlier_mask] + outlier_direction[outlier_mask] * 20
+        outlier_mask = next(uniform) < outlier_rate
+        noisy[outlier_mask] += rng.choice([-20.0, 20.0], size=int(outlier_mask.sum()))
 
     # 4. Missing values
     if missing_rate > 0:
-        missing_mask = np.random.random(n) < missing_rate
+        missing_mask = next(uniform) < missing_rate
         noisy[missing_mask] = np.nan
 
     # 5. Stuck sensor values (repeat previous value)
     if stuck_sensor_rate > 0:
-        stuck_mask = np.random.random(n) < stuck_sensor_rate
-        for i in range(1, n):
-            if stuck_mask[i] and not np.isnan(noisy.iloc[i-1]):
-                noisy.iloc[i] = noisy.iloc[i-1]
+        stuck_mask = next(uniform) < stuck_sensor_rate
+        _apply_stuck_sensor(noisy, stuck_mask)
 
     # Clamp to reasonable range (sensor limits)
-    noisy = noisy.clip(lower=0, upper=100)
+    np.clip(noisy, 0, 100, out=noisy)
 
-    df["t_vorlauf_noisy"] = noisy
+    # Hand the buffer to pandas without another copy (nothing else references it)
+    df["t_vorlauf_noisy"] = pd.Series(noisy, index=df.index, copy=False)
 
     return df
 
 
 def generate_simulation(
     config: dict,
-    weather_df: Optional[pd.DataFrame] = None
+    weather_df: Optional[pd.DataFrame] = None,
+    copy: bool = True
 ) -> pd.DataFrame:
     """
     Generate complete heating curve simulation dataset.
@@ -344,6 +600,9 @@ def generate_simulation(
         - period: dict with start_date/end_date (optional)
     weather_df : pd.DataFrame, optional
         Pre-fetched weather data. If None, fetches from API.
+    copy : bool
+        If False, add the simulated columns to weather_df in place instead
+        of to a copy (only relevant when weather_df is given)
 
     Returns
     -------
@@ -360,51 +619,44 @@ def generate_simulation(
     location = config.get("location", {"latitude": 52.52, "longitude": 13.41})
     period = config.get("period", {"start_date": "2023-11-01", "end_date": "2024-03-31"})
 
-    # Fetch or use provided weather data
+    # Fetch or use provided weather data; a freshly fetched frame is ours
     if weather_df is None:
-        df = fetch_weather_data(
+        copy = False
+        weather_df = fetch_weather_data(
             latitude=location.get("latitude", 52.52),
             longitude=location.get("longitude", 13.41),
             start_date=period.get("start_date", "2023-11-01"),
             end_date=period.get("end_date", "2024-03-31")
         )
-        df = interpolate_to_15min(df)
-    else:
-        df = weather_df.copy()
-
-    # Get room target for each timestamp
-    df["t_room_target"] = df["hour"].apply(
-        lambda h: get_room_target(
-            h,
-            t_room_day=config.get("t_room_day", 20.0),
-            t_room_night=config.get("t_room_night", 16.0),
-            night_start=config.get("night_start_hour", 22),
-            night_end=config.get("night_end_hour", 6)
-        )
+        weather_df = interpolate_to_15min(weather_df)
+
+    # Night mode, room target and ideal Vorlauf (vectorized over readings)
+    is_night, t_room_target, t_vorlauf_ideal = compute_vorlauf(
+        weather_df["t_outdoor"].to_numpy(),
+        weather_df["hour"].to_numpy(),
+        slope=config.get("slope", 1.4),
+        t_base=config.get("t_base", 20.0),
+        t_room_day=config.get("t_room_day", 20.0),
+        t_room_night=config.get("t_room_night", 16.0),
+        t_min=config.get("t_vorlauf_min", 25.0),
+        t_max=config.get("t_vorlauf_max", 75.0),
+        summer_cutoff=config.get("t_outdoor_summer_cutoff", 15.0),
+        night_start=config.get("night_start_hour", 22),
+        night_end=config.get("night_end_hour", 6)
     )
 
-    # Calculate ideal Vorlauf
-    df["t_vorlauf_ideal"] = df.apply(
-        lambda row: calculate_vorlauf(
-            t_outdoor=row["t_outdoor"],
-            t_room=row["t_room_target"],
-            slope=config.get("slope", 1.4),
-            t_base=config.get("t_base", 20.0),
-            t_min=config.get("t_vorlauf_min", 25.0),
-            t_max=config.get("t_vorlauf_max", 75.0),
-            summer_cutoff=config.get("t_outdoor_summer_cutoff", 15.0)
-        ),
-        axis=1
-    )
-
-    # Add night mode indicator
-    df["is_night"] = df["hour"].apply(
-        lambda h: is_night_hour(
-            h,
-            night_start=config.get("night_start_hour", 22),
-            night_end=config.get("night_end_hour", 6)
-        )
-    )
+    # Attach all derived columns (in one copy, or in place if we own the frame)
+    derived = {
+        "t_room_target": t_room_target,
+        "t_vorlauf_ideal": t_vorlauf_ideal,
+        "is_night": is_night,
+    }
+    if copy:
+        df = weather_df.assign(**derived)
+    else:
+        df = weather_df
+        for name, values in derived.items():
+            df[name] = values
 
     # Apply noise if noise model is provided
     noise_model = config.get("noise_model")
@@ -418,7 +670,8 @@ def generate_simulation(
             outlier_rate=noise_model.get("outlier_rate", 0.0),
             stuck_sensor_rate=noise_model.get("stuck_sensor_rate", 0.0),
             vorlauf_col="t_vorlauf_ideal",
-            random_seed=noise_model.get("random_seed", 42)
+            random_seed=noise_model.get("random_seed", 42),
+            copy=False
         )
 
     return df
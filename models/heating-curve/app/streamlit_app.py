@@ -11,6 +11,8 @@ Features:
 Run with: streamlit run app/streamlit_app.py
 """
 
+import io
+
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -34,10 +36,10 @@ from simulation import (
     interpolate_to_15min,
     generate_simulation,
 )
-from analysis import (
-    extract_parameters,
-    detect_temperature_limits,
-)
+
+
+# Maximum number of points sent to the browser in the simulation scatter plot
+MAX_SCATTER_POINTS = 3000
 
 
 # =============================================================================
@@ -60,6 +62,198 @@ heating curve parameters from noisy sensor data.
 """)
 
 
+# =============================================================================
+# Data Loading
+# =============================================================================
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_sensor_csv(data: bytes) -> pd.DataFrame:
+    """Validate and parse an uploaded sensor CSV, cached on its content."""
+    from analysis import ANALYSIS_COLUMNS, csv_header, read_sensor_csv
+
+    buffer = io.BytesIO(data)
+
+    # Validate the header before paying for a full parse
+    header = csv_header(buffer)
+    if "t_outdoor" not in header[1:] or "t_vorlauf" not in header[1:]:
+        raise ValueError("CSV must contain 't_outdoor' and 't_vorlauf' columns")
+
+    # Parse only the index and the columns the analysis uses
+    usecols = [header[0]] + [c for c in ANALYSIS_COLUMNS if c in header[1:]]
+    return read_sensor_csv(buffer, usecols=usecols)
+
+
+# =============================================================================
+# Cached Computations
+# =============================================================================
+# Archive weather is static historical data, so each (location, season) is
+# fetched once per day. Simulations are cached per config, so reruns that do
+# not change any parameter reuse the previous result.
+
+@st.cache_data(ttl=24 * 3600, show_spinner=False)
+def load_weather(latitude: float, longitude: float, start_date: str, end_date: str) -> pd.DataFrame:
+    """Fetch weather data for one location and season at 15-minute resolution."""
+    weather = fetch_weather_data(
+        latitude=latitude,
+        longitude=longitude,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return interpolate_to_15min(weather)
+
+
+@st.cache_data(ttl=24 * 3600, show_spinner=False, max_entries=32)
+def run_simulation(config: dict) -> pd.DataFrame:
+    """Generate a simulation, reusing cached weather for the same location/season."""
+    weather_df = load_weather(
+        config["location"]["latitude"],
+        config["location"]["longitude"],
+        config["period"]["start_date"],
+        config["period"]["end_date"],
+    )
+    # st.cache_data hands out a fresh copy, so the frame can be extended in place
+    return generate_simulation(config, weather_df=weather_df, copy=False)
+
+
+@st.cache_data(ttl=24 * 3600, show_spinner=False, max_entries=8)
+def simulation_csv(config: dict) -> bytes:
+    """CSV export of the simulation for config, serialized once per config."""
+    return run_simulation(config).to_csv().encode("utf-8")
+
+
+def _frame_hash(df: pd.DataFrame) -> tuple:
+    """Cache key for a DataFrame: column labels, dtypes and row contents."""
+    return (
+        tuple(df.columns),
+        tuple(map(str, df.dtypes)),
+        pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes(),
+    )
+
+
+@st.cache_data(
+    show_spinner=False,
+    max_entries=16,
+    hash_funcs={pd.DataFrame: _frame_hash},
+)
+def run_extraction(analysis_df: pd.DataFrame, algorithms: tuple, use_detected_modes: bool) -> dict:
+    """Extract parameters, cached on the full data content and settings."""
+    # Imported here so the analysis module only loads once extraction runs
+    from analysis import extract_parameters
+
+    results = extract_parameters(
+        analysis_df,
+        outdoor_col="t_outdoor",
+        vorlauf_col="t_vorlauf",
+        algorithms=list(algorithms),
+        t_base=20.0,
+        use_detected_modes=use_detected_modes,
+        is_night_col="is_night"
+    )
+    # Fitted model objects are not displayed; keep the cached payload small
+    for algo_results in results["algorithms"].values():
+        for mode in ("day", "night"):
+            algo_results[mode].pop("model", None)
+    return results
+
+
+@st.cache_data(show_spinner=False)
+def theoretical_curves(
+    slope: float,
+    t_room_day: float,
+    t_room_night: float,
+    t_vorlauf_min: float,
+    t_vorlauf_max: float,
+    t_low: float,
+    t_high: float,
+    t_base: float = 20.0,
+):
+    """
+    Day and night heating curves over [t_low, t_high], clipped to the limits.
+
+    The clipped curves are piecewise linear, so they are evaluated only at the
+    range endpoints and at the points where they hit a limit.
+    """
+    knots = [t_low, t_high]
+    for t_room in (t_room_day, t_room_night):
+        for limit in (t_vorlauf_min, t_vorlauf_max):
+            knots.append(t_room - (limit - t_base) / slope)
+    t_out_range = np.unique(np.clip(knots, t_low, t_high))
+
+    t_vor_day = np.clip(t_base + slope * (t_room_day - t_out_range), t_vorlauf_min, t_vorlauf_max)
+    t_vor_night = np.clip(t_base + slope * (t_room_night - t_out_range), t_vorlauf_min, t_vorlauf_max)
+    return t_out_range, t_vor_day, t_vor_night
+
+
+# =============================================================================
+# Result Formatting
+# =============================================================================
+
+# Extracted parameters in the results table:
+# (parameter key, ground-truth key, column label, error column label, format)
+RESULT_PARAMETERS = [
+    ("K", "slope", "Slope (K)", "K Error", "%.4f"),
+    ("T_room_day", "T_room_day", "T_room Day (°C)", "Day Error (°C)", "%.2f"),
+    ("T_room_night", "T_room_night", "T_room Night (°C)", "Night Error (°C)", "%.2f"),
+]
+
+# Number format of every results table column
+RESULT_COLUMN_FORMATS = {
+    **{label: fmt for _, _, label, _, fmt in RESULT_PARAMETERS},
+    "R² (Day)": "%.4f",
+    **{error_label: fmt for _, _, _, error_label, fmt in RESULT_PARAMETERS},
+}
+
+
+def _prepare_payload(results: dict, ground_truth: dict = None) -> dict:
+    """
+    Build everything the results view renders, once per extraction.
+
+    Returns the formatted limit strings, the per-algorithm results table
+    (with absolute errors when ground truth is known) and the ground truth
+    table (None without ground truth), so reruns only draw.
+    """
+    upper = results["detected_limits"]["upper"]
+    lower = results["detected_limits"]["lower"]
+
+    algos = list(results["algorithms"])
+    params_vec = np.array([
+        [
+            results["algorithms"][algo].get("parameters", {}).get(key, np.nan)
+            for key, _, _, _, _ in RESULT_PARAMETERS
+        ]
+        for algo in algos
+    ], dtype=float).reshape(len(algos), len(RESULT_PARAMETERS))
+
+    results_table = pd.DataFrame(
+        params_vec,
+        columns=[label for _, _, label, _, _ in RESULT_PARAMETERS],
+        index=pd.Index(algos, name="Algorithm"),
+    )
+    results_table["R² (Day)"] = [
+        (results["algorithms"][algo].get("day") or {}).get("r2", np.nan)
+        for algo in algos
+    ]
+
+    ground_truth_table = None
+    if ground_truth:
+        truth_vec = np.array([ground_truth[key] for _, key, _, _, _ in RESULT_PARAMETERS])
+        errs = np.abs(params_vec - truth_vec)
+        for i, (_, _, _, error_label, _) in enumerate(RESULT_PARAMETERS):
+            results_table[error_label] = errs[:, i]
+
+        ground_truth_table = pd.DataFrame(
+            {"Ground Truth": [fmt % value for value, (*_, fmt) in zip(truth_vec, RESULT_PARAMETERS)]},
+            index=[label for _, _, label, _, _ in RESULT_PARAMETERS],
+        )
+
+    return {
+        "upper_limit": f"{upper:.1f}°C" if upper else "Not detected",
+        "lower_limit": f"{lower:.1f}°C" if lower else "Not detected",
+        "results_table": results_table,
+        "ground_truth_table": ground_truth_table,
+    }
+
+
 # =============================================================================
 # Sidebar - Documentation
 # =============================================================================
@@ -300,7 +494,7 @@ with tab1:
     if generate_clicked or "sim_data" not in st.session_state:
         with st.spinner("Fetching weather data and generating simulation..."):
             try:
-                df = generate_simulation(config)
+                df = run_simulation(config)
                 st.session_state["sim_data"] = df
                 st.session_state["sim_config"] = config
             except Exception as e:
@@ -342,9 +536,13 @@ with tab1:
             # Scatter plot
             vorlauf_col = "t_vorlauf_noisy" if "t_vorlauf_noisy" in df.columns else "t_vorlauf_ideal"
 
-            # Prepare data for plotting
-            plot_df = df[["t_outdoor", vorlauf_col, "is_night"]].dropna().copy()
-            plot_df["Mode"] = plot_df["is_night"].map({True: "Night", False: "Day"})
+            # Prepare data for plotting (random subsample keeps the browser responsive;
+            # a few thousand points are visually indistinguishable from all of them)
+            plot_df = df[["t_outdoor", vorlauf_col, "is_night"]].dropna()
+            n_valid = len(plot_df)
+            if n_valid > MAX_SCATTER_POINTS:
+                plot_df = plot_df.sample(n=MAX_SCATTER_POINTS, random_state=0)
+            plot_df = plot_df.assign(Mode=np.where(plot_df["is_night"], "Night", "Day"))
 
             fig = px.scatter(
                 plot_df,
@@ -360,14 +558,11 @@ with tab1:
                 title=f"Heating Curve Scatter Plot ({noise_model_name})"
             )
 
-            # Add theoretical heating curve lines
-            t_out_range = np.linspace(df["t_outdoor"].min(), df["t_outdoor"].max(), 100)
-            t_vor_day = 20 + slope * (t_room_day - t_out_range)
-            t_vor_night = 20 + slope * (t_room_night - t_out_range)
-
-            # Clip to limits
-            t_vor_day = np.clip(t_vor_day, t_vorlauf_min, t_vorlauf_max)
-            t_vor_night = np.clip(t_vor_night, t_vorlauf_min, t_vorlauf_max)
+            # Add theoretical heating curve lines (clipped to limits)
+            t_out_range, t_vor_day, t_vor_night = theoretical_curves(
+                slope, t_room_day, t_room_night, t_vorlauf_min, t_vorlauf_max,
+                float(df["t_outdoor"].min()), float(df["t_outdoor"].max()),
+            )
 
             fig.add_trace(go.Scatter(
                 x=t_out_range, y=t_vor_day,
@@ -388,11 +583,13 @@ with tab1:
             )
 
             st.plotly_chart(fig, use_container_width=True)
+            if n_valid > MAX_SCATTER_POINTS:
+                st.caption(f"Showing a random sample of {MAX_SCATTER_POINTS:,} of {n_valid:,} points.")
 
             # Download button
             st.download_button(
                 label="📥 Download Simulated Data (CSV)",
-                data=df.to_csv(),
+                data=simulation_csv(stored_config),
                 file_name="heating_curve_simulation.csv",
                 mime="text/csv",
             )
@@ -402,7 +599,13 @@ with tab1:
 # Tab 2: Analysis
 # =============================================================================
 
-with tab2:
+def _run_tab2() -> None:
+    """
+    Render the analysis tab.
+
+    Missing data or settings end the tab early with a message, so the rest
+    of the page (e.g. the footer) still renders.
+    """
     st.header("Heating Curve Parameter Extraction")
     st.markdown("""
     Extract heating curve parameters from simulated or uploaded sensor data
@@ -416,17 +619,14 @@ with tab2:
         horizontal=True,
     )
 
-    analysis_df = None
     ground_truth = None
 
     if data_source == "Use Simulated Data":
         if "sim_data" in st.session_state:
-            analysis_df = st.session_state["sim_data"].copy()
-            # Rename column for analysis
-            if "t_vorlauf_noisy" in analysis_df.columns:
-                analysis_df["t_vorlauf"] = analysis_df["t_vorlauf_noisy"]
-            else:
-                analysis_df["t_vorlauf"] = analysis_df["t_vorlauf_ideal"]
+            # Alias the Vorlauf column for analysis; assign leaves session data untouched
+            sim_data = st.session_state["sim_data"]
+            vorlauf_source = "t_vorlauf_noisy" if "t_vorlauf_noisy" in sim_data.columns else "t_vorlauf_ideal"
+            analysis_df = sim_data.assign(t_vorlauf=sim_data[vorlauf_source])
 
             # Get ground truth from simulation config
             if "sim_config" in st.session_state:
@@ -438,7 +638,7 @@ with tab2:
                 }
         else:
             st.warning("No simulated data available. Generate data in the Simulation tab first.")
-            st.stop()
+            return
     else:
         uploaded_file = st.file_uploader(
             "Upload CSV file",
@@ -447,122 +647,77 @@ with tab2:
         )
         if uploaded_file is not None:
             try:
-                analysis_df = pd.read_csv(uploaded_file, parse_dates=True, index_col=0)
-                if "t_outdoor" not in analysis_df.columns or "t_vorlauf" not in analysis_df.columns:
-                    st.error("CSV must contain 't_outdoor' and 't_vorlauf' columns")
-                    st.stop()
+                analysis_df = load_sensor_csv(uploaded_file.getvalue())
             except Exception as e:
                 st.error(f"Error reading CSV: {e}")
-                st.stop()
+                return
         else:
             st.info("Please upload a CSV file with 't_outdoor' and 't_vorlauf' columns.")
-            st.stop()
-
-    if analysis_df is not None:
-        # Algorithm selection
-        st.subheader("Algorithm Selection")
-        col_algo1, col_algo2 = st.columns(2)
-        with col_algo1:
-            use_ols = st.checkbox("OLS (Ordinary Least Squares)", value=True)
-        with col_algo2:
-            use_ransac = st.checkbox("RANSAC (Outlier Robust)", value=True)
-
-        algorithms = []
-        if use_ols:
-            algorithms.append("OLS")
-        if use_ransac:
-            algorithms.append("RANSAC")
-
-        if not algorithms:
-            st.warning("Select at least one algorithm")
-            st.stop()
-
-        # Run analysis
-        if st.button("🔍 Extract Parameters", type="primary"):
-            with st.spinner("Extracting parameters..."):
-                results = extract_parameters(
-                    analysis_df,
-                    outdoor_col="t_outdoor",
-                    vorlauf_col="t_vorlauf",
-                    algorithms=algorithms,
-                    t_base=20.0,
-                    use_detected_modes=False if "is_night" in analysis_df.columns else True,
-                    is_night_col="is_night"
-                )
-                st.session_state["analysis_results"] = results
-
-        # Display results
-        if "analysis_results" in st.session_state:
-            results = st.session_state["analysis_results"]
+            return
+
+    # Algorithm selection
+    st.subheader("Algorithm Selection")
+    col_algo1, col_algo2 = st.columns(2)
+    with col_algo1:
+        use_ols = st.checkbox("OLS (Ordinary Least Squares)", value=True)
+    with col_algo2:
+        use_ransac = st.checkbox("RANSAC (Outlier Robust)", value=True)
+
+    algorithms = []
+    if use_ols:
+        algorithms.append("OLS")
+    if use_ransac:
+        algorithms.append("RANSAC")
+
+    if not algorithms:
+        st.warning("Select at least one algorithm")
+        return
+
+    # Run analysis
+    if st.button("🔍 Extract Parameters", type="primary"):
+        with st.spinner("Extracting parameters..."):
+            results = run_extraction(
+                analysis_df,
+                tuple(algorithms),
+                use_detected_modes="is_night" not in analysis_df.columns,
+            )
+            st.session_state["analysis_payload"] = _prepare_payload(results, ground_truth)
+
+    # Display results (formatted once, when the results were stored)
+    if "analysis_payload" in st.session_state:
+        payload = st.session_state["analysis_payload"]
+
+        st.subheader("Extracted Parameters")
+
+        # Detected limits
+        col_lim1, col_lim2 = st.columns(2)
+        with col_lim1:
+            st.metric("Detected Upper Limit", payload["upper_limit"])
+        with col_lim2:
+            st.metric("Detected Lower Limit", payload["lower_limit"])
+
+        st.divider()
+
+        # Results table: one component for all algorithms
+        st.dataframe(
+            payload["results_table"],
+            use_container_width=True,
+            column_config={
+                col: st.column_config.NumberColumn(format=fmt)
+                for col, fmt in RESULT_COLUMN_FORMATS.items()
+            },
+        )
 
-            st.subheader("Extracted Parameters")
+        st.divider()
 
-            # Detected limits
-            col_lim1, col_lim2 = st.columns(2)
-            with col_lim1:
-                upper = results["detected_limits"]["upper"]
-                st.metric(
-                    "Detected Upper Limit",
-                    f"{upper:.1f}°C" if upper else "Not detected"
-                )
-            with col_lim2:
-                lower = results["detected_limits"]["lower"]
-                st.metric(
-                    "Detected Lower Limit",
-                    f"{lower:.1f}°C" if lower else "Not detected"
-                )
+        # Comparison with ground truth
+        if payload["ground_truth_table"] is not None:
+            st.subheader("Ground Truth Comparison")
+            st.table(payload["ground_truth_table"])
 
-            st.divider()
 
-            # Results table
-            for algo, algo_results in results["algorithms"].items():
-                params = algo_results.get("parameters", {})
-
-                st.markdown(f"**{algo} Results**")
-
-                col_res1, col_res2, col_res3 = st.columns(3)
-
-                with col_res1:
-                    K = params.get("K", float("nan"))
-                    if ground_truth:
-                        err = abs(K - ground_truth["slope"])
-                        st.metric("Slope (K)", f"{K:.4f}", delta=f"Error: {err:.4f}")
-                    else:
-                        st.metric("Slope (K)", f"{K:.4f}")
-
-                with col_res2:
-                    T_day = params.get("T_room_day", float("nan"))
-                    if ground_truth:
-                        err = abs(T_day - ground_truth["T_room_day"])
-                        st.metric("T_room Day", f"{T_day:.2f}°C", delta=f"Error: {err:.2f}°C")
-                    else:
-                        st.metric("T_room Day", f"{T_day:.2f}°C")
-
-                with col_res3:
-                    T_night = params.get("T_room_night", float("nan"))
-                    if ground_truth:
-                        err = abs(T_night - ground_truth["T_room_night"])
-                        st.metric("T_room Night", f"{T_night:.2f}°C", delta=f"Error: {err:.2f}°C")
-                    else:
-                        st.metric("T_room Night", f"{T_night:.2f}°C")
-
-                # R² scores
-                if algo_results.get("day"):
-                    r2_day = algo_results["day"].get("r2", float("nan"))
-                    st.caption(f"R² (Day): {r2_day:.4f}")
-
-                st.divider()
-
-            # Comparison with ground truth
-            if ground_truth:
-                st.subheader("Ground Truth Comparison")
-                st.markdown(f"""
-                | Parameter | Ground Truth |
-                |-----------|--------------|
-                | Slope (K) | {ground_truth['slope']:.4f} |
-                | T_room Day | {ground_truth['T_room_day']:.2f}°C |
-                | T_room Night | {ground_truth['T_room_night']:.2f}°C |
-                """)
+with tab2:
+    _run_tab2()
 
 
 # =============================================================================
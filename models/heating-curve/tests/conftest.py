@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# App modules import each other as top-level modules (see streamlit_app.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis import _fit_ols_grouped, detect_temperature_limits, extract_parameters, fit_ols
+
+
+def test_ransac_skips_constant_outdoor_temperature():
+    n = 400
+    df = pd.DataFrame({
+        "t_outdoor": np.full(n, 5.0),
+        "t_vorlauf": 50 + np.random.default_rng(0).normal(0, 1, n),
+        "is_night": np.arange(n) % 3 == 0,
+    })
+
+    results = extract_parameters(df, algorithms=["RANSAC"])
+
+    assert results["algorithms"]["RANSAC"] == {"day": {}, "night": {}, "parameters": {}}
+
+
+def test_zero_percentile_threshold_detects_no_limits():
+    df = pd.DataFrame({"t_vorlauf": np.clip(np.linspace(20, 80, 1000), 25, 75)})
+
+    assert detect_temperature_limits(df, percentile_threshold=0) == (None, None)
+
+
+def test_ols_r2_is_one_for_constant_y():
+    x = np.linspace(-10, 15, 200)
+    y = np.full(200, 0.1)
+
+    with np.errstate(all="raise"):
+        fit = fit_ols(x, y)
+        grouped = _fit_ols_grouped(x, y, (np.arange(200) % 2).astype(np.intp), 2)
+
+    assert fit["r2"] == 1.0
+    assert fit["slope"] == pytest.approx(0.0, abs=1e-12)
+    assert [g["r2"] for g in grouped] == [1.0, 1.0]
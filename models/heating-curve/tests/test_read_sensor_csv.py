@@ -0,0 +1,55 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis import extract_parameters, read_sensor_csv
+
+pytest.importorskip("pyarrow")
+
+
+def _gappy_csv() -> bytes:
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2024-01-01", periods=400, freq="15min", name="datetime")
+    t_outdoor = rng.uniform(-10, 15, index.size).round(1)
+    is_night = pd.array((index.hour >= 22) | (index.hour < 6), dtype="boolean")
+    is_night[::7] = pd.NA
+    t_vorlauf = (20 + 1.4 * (np.where(is_night.fillna(False), 16, 20) - t_outdoor)).round(1)
+    df = pd.DataFrame(
+        {"t_outdoor": t_outdoor, "t_vorlauf": t_vorlauf, "is_night": is_night},
+        index=index,
+    )
+    return df.to_csv().encode("utf-8")
+
+
+@pytest.mark.parametrize("usecols", [None, ["datetime", "t_outdoor", "t_vorlauf", "is_night"]])
+def test_missing_night_flags_match_across_engines(usecols):
+    data = _gappy_csv()
+    frames = {
+        engine: read_sensor_csv(io.BytesIO(data), usecols=usecols, engine=engine)
+        for engine in ("pyarrow", "c")
+    }
+
+    for df in frames.values():
+        assert df["is_night"].dtype == "boolean"
+        assert df["is_night"].isna().sum() == len(df[::7])
+    # Timestamp resolution may differ by engine; values and labels must not
+    pyarrow_df, c_df = frames["pyarrow"], frames["c"]
+    assert (pyarrow_df.index == c_df.index).all()
+    pd.testing.assert_frame_equal(
+        pyarrow_df.reset_index(drop=True), c_df.reset_index(drop=True)
+    )
+
+
+def test_missing_night_flags_are_excluded_from_fits():
+    data = _gappy_csv()
+    results = [
+        extract_parameters(read_sensor_csv(io.BytesIO(data), engine=engine), algorithms=["OLS"])
+        for engine in ("pyarrow", "c")
+    ]
+
+    params = [r["algorithms"]["OLS"]["parameters"] for r in results]
+    assert params[0] == params[1]
+    assert params[0]["K"] == pytest.approx(1.4, abs=1e-3)
+    assert params[0]["T_room_night"] == pytest.approx(16.0, abs=0.1)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+import simulation
+
+pytest.importorskip("pyarrow")
+
+
+class _FakeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"hourly": {
+            "time": ["2024-01-01T00:00", "2024-01-01T01:00", "2024-01-01T02:00"],
+            "temperature_2m": [1.5, 0.5, -0.5],
+        }}
+
+
+def test_weather_cache_follows_environment(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(
+        simulation._session, "get",
+        lambda *args, **kwargs: calls.append(args) or _FakeResponse(),
+    )
+
+    fetched = simulation.fetch_weather_data(start_date="2024-01-01", end_date="2024-01-01")
+    cached = simulation.fetch_weather_data(start_date="2024-01-01", end_date="2024-01-01")
+
+    assert len(calls) == 1
+    assert [p.suffix for p in (tmp_path / "heating-curve").iterdir()] == [".parquet"]
+    np.testing.assert_array_equal(cached["t_outdoor"], fetched["t_outdoor"])
+    assert (cached.index == fetched.index).all()